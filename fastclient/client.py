@@ -1,12 +1,18 @@
 import dataclasses
+import itertools
+import linecache
+import string
 from collections.abc import Callable
-from functools import cached_property, wraps
-from typing import Any, Literal, ParamSpec, TypeAlias, TypeVar, get_type_hints
+from functools import cached_property, lru_cache, wraps
+from typing import Any, Literal, ParamSpec, TypeAlias, TypeVar, get_origin
+from urllib.parse import quote, urlsplit
 
+import annotated_types
 import httpx
-import pydantic
-from fastapi import params as fastapi_params
+from fastapi.params import Body, Header, Param, ParamTypes, Query
 from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+from pydantic_core import from_json, to_jsonable_python
 from typing_extensions import TypedDict
 
 JSON: TypeAlias = dict
@@ -20,9 +26,40 @@ valid_return_types = (
 T = TypeVar("T", bound=BaseModel)
 R = TypeVar("R", BaseModel, JSON, httpx.Response)
 P = ParamSpec("P")
+K = TypeVar("K")
+V = TypeVar("V")
 
 
-@dataclasses.dataclass
+# Maps param location onto `ApiMethodParams` attribute. Cookies are not supported yet.
+_IN_TO_ATTR = {
+    ParamTypes.query: "query",
+    ParamTypes.path: "path",
+    ParamTypes.header: "header",
+}
+
+
+def _is_class(annotation: Any) -> bool:
+    # Generic aliases like `list[int]` pass `isinstance(..., type)` on Python 3.10, but `issubclass` rejects them.
+    return isinstance(annotation, type) and get_origin(annotation) is None
+
+
+def _is_model_type(annotation: Any) -> bool:
+    return _is_class(annotation) and issubclass(annotation, BaseModel)
+
+
+def _cached_call(func: Callable[[K], V], key: K) -> V:
+    """
+    Calls an `lru_cache` decorated function of annotations. If some annotation metadata is not hashable,
+    the result can't be memoized, so the undecorated function is called instead.
+    """
+    try:
+        hash(key)
+    except TypeError:
+        return func.__wrapped__(key)
+    return func(key)
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
 class ApiMethodParams:
     body: dict[str, ParamSpec] = dataclasses.field(default_factory=dict)
     path: dict[str, ParamSpec] = dataclasses.field(default_factory=dict)
@@ -31,151 +68,550 @@ class ApiMethodParams:
 
     @cached_property
     def request(self) -> dict[str, ParamSpec]:
-        """Merges all mappings into one"""
-        return {**self.path, **self.query, **self.body}
+        """Merges all mappings into one. A single non-empty mapping is returned as is, without copying."""
+        groups = [group for group in (self.path, self.query, self.header, self.body) if group]
+        if len(groups) <= 1:
+            return groups[0] if groups else {}
+
+        merged = groups[0] | groups[1]
+        for group in groups[2:]:
+            merged |= group
+        return merged
 
     @staticmethod
-    def from_api_method(request_func):
-        api_params = ApiMethodParams()
-        for param_key, param_spec in request_func.__annotations__.items():
-            # TODO: Create a class, so we can do cleaner structural matching instead of this tuple madness
-            match_expr = (
-                param_key,
-                param_spec,
-                getattr(param_spec, "__origin__", None),
-                getattr(param_spec, "__metadata__", None),
-            )
-            match match_expr:
-                case ("return", _, _, _):
-                    # Return type is always under a known value. We get this type by other means.
-                    continue
-                case (_, _, type() as klass, (*_, fastapi_params.Query())) if issubclass(klass, pydantic.BaseModel):
+    def from_api_method(request_func) -> "ApiMethodParams":
+        """Params are shared between API methods of the same signature, so they must not be modified."""
+        # Return type is always under a known value. We get this type by other means.
+        annotations = tuple(item for item in request_func.__annotations__.items() if item[0] != "return")
+        api_params = _cached_call(_parse_annotations, annotations)
+
+        return api_params
+
+
+@lru_cache(maxsize=1024)
+def _parse_annotations(annotations: tuple[tuple[str, Any], ...]) -> ApiMethodParams:
+    api_params = ApiMethodParams()
+    for param_key, param_spec in annotations:
+        metadata = getattr(param_spec, "__metadata__", None)
+        if metadata is None:
+            if isinstance(param_spec, type):  # TODO: if issubclass(klass, (pydantic.BaseModel, dict))
+                # Simple type annotation. We're looking for Pydantic model, dataclasses, TypedDicts...
+                api_params.body[param_key] = param_spec
+            continue
+
+        for param in reversed(metadata):
+            if isinstance(param, Param):
+                # Captures all explicitly annotated params (query, path, header, cookie)
+                if isinstance(param, Query) and _is_model_type(param_spec.__origin__):
                     # A model representing multiple query params
                     # TODO: query params from complex models should somehow be merged.
-                    # TODO: add a warning if query param name is reused in multiple models (take aliases into account?)
-                    # api_params.query[param_key] = param_spec
-                    # continue
+                    # TODO: add a warning if query param name is reused in multiple models
+                    #  (take aliases into account?)
                     raise NotImplementedError("Multiple query params models are not yet supported.")
-                case (_, _, _, (*_, fastapi_params.Param() as param)):
-                    # Captures all explicitly annotated params (query, path, header, cookie)
-                    getattr(api_params, param.in_.value, {})[param_key] = param_spec
-                    continue
-                case (_, _, _, (*_, fastapi_params.Body())):
-                    # Captures explicitly annotated request body
-                    api_params.body[param_key] = param_spec
-                    continue
-                case (_, type(), _, None):  # TODO: if issubclass(klass, (pydantic.BaseModel, dict))
-                    # Simple type annotation. We're looking for Pydantic model, dataclasses, TypedDicts...
-                    api_params.body[param_key] = param_spec
-                    continue
 
-        return api_params
+                bucket = _IN_TO_ATTR.get(param.in_)
+                if bucket is None:
+                    raise NotImplementedError("Cookie params are not yet supported.")
+                getattr(api_params, bucket)[param_key] = param_spec
+                break
+            if isinstance(param, Body):
+                # Captures explicitly annotated request body
+                api_params.body[param_key] = param_spec
+                break
+
+    return api_params
+
+
+@lru_cache(maxsize=512)
+def _typed_dict_adapter(fields: tuple[tuple[str, Any], ...]) -> TypeAdapter:
+    """
+    Builds a `TypeAdapter` over a `TypedDict` made of given fields.
+
+    Building the core schema is by far the most expensive part of the decorator,
+    so endpoints with identical signatures share one adapter.
+    Fields order is kept as is, since it drives the order of serialized keys.
+    """
+    return TypeAdapter(TypedDict("P", dict(fields)))
+
+
+# Raw header pairs, as HTTPX keeps them internally, so it has nothing to encode.
+_DEFAULT_JSON_HEADERS = ((b"Content-Type", b"application/json"),)
+
+# Default of generated API method params, telling apart params that were not given.
+_MISSING = object()
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, bytes})
+
+_NUMBER_TYPES = frozenset({int, float})
+_SIZED_TYPES = frozenset({str, bytes})
+
+# Constraints checked inline, as `constraint class: (attribute, types it applies to, predicate template)`.
+_PREDICATES = {
+    annotated_types.Gt: ("gt", _NUMBER_TYPES, "{value} > {limit}"),
+    annotated_types.Ge: ("ge", _NUMBER_TYPES, "{value} >= {limit}"),
+    annotated_types.Lt: ("lt", _NUMBER_TYPES, "{value} < {limit}"),
+    annotated_types.Le: ("le", _NUMBER_TYPES, "{value} <= {limit}"),
+    annotated_types.MultipleOf: ("multiple_of", _NUMBER_TYPES, "{value} % {limit} == 0"),
+    annotated_types.MinLen: ("min_length", _SIZED_TYPES, "_len({value}) >= {limit}"),
+    annotated_types.MaxLen: ("max_length", _SIZED_TYPES, "_len({value}) <= {limit}"),
+}
+
+FastField: TypeAlias = tuple[str, type, tuple[tuple[str, Any], ...]]
+
+
+def _is_passed_through(annotation: Any) -> bool:
+    """
+    Tells whether Pydantic returns instances of exactly this model or dataclass type as they are,
+    which it does unless the type is configured to revalidate instances.
+    """
+    if _is_model_type(annotation):
+        config = annotation.model_config
+    elif _is_class(annotation) and dataclasses.is_dataclass(annotation):
+        config = getattr(annotation, "__pydantic_config__", {})
+    else:
+        return False
+    return config.get("revalidate_instances", "never") == "never"
+
+
+def _is_scalar_type(annotation: Any) -> bool:
+    # Checked on exact class first, as typing constructs with unhashable metadata can't be looked up in a set.
+    return type(annotation) is type and annotation in _SCALAR_TYPES
+
+
+def _fast_field(param_key: str, param_spec: Any) -> FastField | None:
+    """
+    Returns the exact type of a param and its constraints as `(predicate template, limit)` tuples,
+    if a value of that very type which satisfies all predicates would pass validation unchanged.
+    That's the case for scalars, and for models and dataclasses, whose instances are not revalidated.
+    Any constraint without an inline predicate, or a validation alias, disqualifies the param.
+    """
+    if _is_scalar_type(param_spec) or _is_passed_through(param_spec):
+        return param_key, param_spec, ()
+
+    origin = getattr(param_spec, "__origin__", None)
+    if not _is_scalar_type(origin) and not _is_passed_through(origin):
+        return None
+
+    constraints = []
+    for metadata in getattr(param_spec, "__metadata__", ()):
+        if isinstance(metadata, (Param, Body)):
+            if metadata.alias is not None or metadata.validation_alias is not None:
+                return None
+            # Constraints passed as keyword arguments, eg. `Query(gt=0)`
+            candidates = metadata.metadata
+        elif isinstance(metadata, annotated_types.GroupedMetadata):
+            # Eg. `Interval(gt=0, lt=10)`
+            candidates = tuple(metadata)
+        else:
+            candidates = (metadata,)
+
+        for constraint in candidates:
+            predicate = _PREDICATES.get(type(constraint))
+            if predicate is None:
+                return None
+            attribute, types, template = predicate
+            limit = getattr(constraint, attribute)
+            if origin not in types or (attribute == "multiple_of" and not limit):
+                return None
+            constraints.append((template, limit))
+
+    return param_key, origin, tuple(constraints)
+
+
+def _fast_conditions(fields: tuple[FastField, ...], names: tuple[str, ...], namespace: dict[str, Any]) -> str:
+    """
+    Returns source of the condition for params, held in the given variable names, to skip validation:
+    each of exact type and satisfying its constraints, one condition per constraint.
+    Builtins are bound to private names, so params can't shadow them.
+    """
+    namespace.update(_typeof=type, _len=len)
+    conditions = []
+    for index, ((_, field_type, constraints), name) in enumerate(zip(fields, names)):
+        namespace[f"_type{index}"] = field_type
+        conditions.append(f"_typeof({name}) is _type{index}")
+        for constraint_index, (template, limit) in enumerate(constraints):
+            namespace[f"_limit{index}_{constraint_index}"] = limit
+            conditions.append(template.format(value=name, limit=f"_limit{index}_{constraint_index}"))
+    return " and ".join(conditions)
+
+
+def _encode_query_value(value: Any) -> str:
+    """Encodes query value the same way HTTPX does. JSON-like booleans, empty `None`, percent-encoded otherwise."""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return ""
+    if type(value) is int:
+        # Digits and a minus sign are never escaped.
+        return str(value)
+
+    value = str(value)
+    if value.isascii() and value.isalnum():
+        return value
+    return quote(value, safe="")
+
+
+def _encode_query_param(prefix: str, value: Any) -> str:
+    """Encodes a single query param, prefixed with its `encoded_alias=`. Lists become repeated params."""
+    if isinstance(value, (list, tuple)):
+        return "&".join(prefix + _encode_query_value(item) for item in value)
+
+    return prefix + _encode_query_value(value)
+
+
+def _serialization_alias(param_key: str, param_spec: Any) -> str:
+    """Alias used when sending the param over the wire. Falls back to the param name."""
+    for metadata in reversed(getattr(param_spec, "__metadata__", ())):
+        if isinstance(metadata, FieldInfo):
+            return metadata.serialization_alias or param_key
+
+    return param_key
+
+
+def _header_name(param_key: str, param_spec: Any) -> bytes:
+    """
+    Header name sent over the wire, ASCII encoded, as HTTPX requires. Without an alias,
+    underscores of the param name become hyphens, unless disabled with `Header(convert_underscores=False)`.
+    """
+    for metadata in reversed(getattr(param_spec, "__metadata__", ())):
+        if isinstance(metadata, FieldInfo):
+            alias = metadata.serialization_alias or metadata.alias
+            if alias:
+                return alias.encode("ascii")
+            if isinstance(metadata, Header) and metadata.convert_underscores:
+                return param_key.replace("_", "-").encode("ascii")
+            break
+
+    return param_key.encode("ascii")
+
+
+def _encode_header_value(value: Any) -> str:
+    """Header values are sent as strings. Other values are dumped the way JSON would, booleans as in query."""
+    if type(value) is str:
+        return value
+
+    value = to_jsonable_python(value)
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return value if isinstance(value, str) else str(value)
 
 
 class ApiMethodTypeAdapters:
+    __slots__ = (
+        "_params",
+        "_request",
+        "_body_only",
+        "_path_aliases",
+        "_header_aliases",
+        "_query_prefixes",
+        "_fast_fields",
+        "_static_headers",
+    )
+
     def __init__(self, params: ApiMethodParams):
         self._params = params
-
-    @cached_property
-    def request(self) -> TypeAdapter:
-        return TypeAdapter(TypedDict("RequestParams", self._params.request))
-
-    @cached_property
-    def header(self) -> TypeAdapter | None:
-        return TypeAdapter(TypedDict("HeaderParams", self._params.header))
-
-    @cached_property
-    def query(self) -> TypeAdapter | None:
-        return TypeAdapter(TypedDict("QueryParams", self._params.query))
-
-    @cached_property
-    def body(self) -> TypeAdapter | None:
-        return TypeAdapter(TypedDict("BodyParams", self._params.body))
-
-    def _build_query_params(self, kwargs) -> dict | None:
-        return self.query.dump_python(kwargs, by_alias=True) if self.query else None
-
-    @cached_property
-    def path(self) -> TypeAdapter | None:
-        return TypeAdapter(TypedDict("PathParams", self._params.path))
-
-    def _build_request_url(self, url: str, kwargs: dict) -> str:
-        if not self.path:
-            return url
-
-        return url.format(**self.path.dump_python(kwargs))
-
-    def validate_request_params(self, params: dict[str, Any]) -> dict[str, Any]:
-        """
-        :raises pydantic.ValidationError: In case of validation results
-        :return: Validated data
-        """
-        return self.request.validate_python(params)
-
-    def _build_request_content(self, kwargs) -> bytes | None:
-        """Get request content as json bytes. Uses Pydantic`s json serialization. Respects aliases."""
-        if not self.body:
-            return None
-
-        return self.body.dump_json(kwargs, by_alias=True)
-
-    def build_request(self, method: str, url: str, **kwargs) -> httpx.Request:
-        return httpx.Request(
-            method,
-            url=self._build_request_url(url, kwargs),
-            params=self._build_query_params(kwargs),
-            content=self._build_request_content(kwargs),
-            # TODO: smarter header values, when we add support for FormData and files.
-            headers={
-                "Content-Type": "application/json",
-                **self._build_request_headers(kwargs),
-            },
+        # A single schema per endpoint, built upfront. It validates all params and serializes the body.
+        self._request: TypeAdapter | None = (
+            _cached_call(_typed_dict_adapter, tuple(params.request.items())) if params.request else None
         )
+        # Validated data of body-only endpoints is serialized as a whole, without splitting it first.
+        self._body_only = bool(params.body) and len(params.body) == len(params.request)
+        # Validation happens once, for the whole request. Aliases below, as `(param name, alias)`,
+        # are used to pick validated data for each part of the request.
+        self._path_aliases = tuple(
+            (param_key, _serialization_alias(param_key, param_spec)) for param_key, param_spec in params.path.items()
+        )
+        # Header names are encoded upfront, HTTPX requires them to be ASCII anyway.
+        self._header_aliases = tuple(
+            (param_key, _header_name(param_key, param_spec)) for param_key, param_spec in params.header.items()
+        )
+        # Query string is encoded by hand, as `(param name, "encoded_alias=")` pairs, bypassing HTTPX `QueryParams`.
+        self._query_prefixes = tuple(
+            (param_key, quote(_serialization_alias(param_key, param_spec), safe="") + "=")
+            for param_key, param_spec in params.query.items()
+        )
+        # Set only when every param is a plain, possibly constrained, scalar, or a model or dataclass instance.
+        # Such values can skip validation.
+        fast_fields = tuple(_fast_field(param_key, param_spec) for param_key, param_spec in params.request.items())
+        self._fast_fields = fast_fields if fast_fields and all(field is not None for field in fast_fields) else None
+        # TODO: smarter header values, when we add support for FormData and files.
+        self._static_headers = _DEFAULT_JSON_HEADERS
 
-    def _build_request_headers(self, kwargs):
-        return self.header.dump_python(kwargs) if self.header else None
-
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def from_params(params: ApiMethodParams) -> "ApiMethodTypeAdapters":
+        """One instance per unique signature, as memoized params are shared too."""
+        return ApiMethodTypeAdapters(params)
+
+
+def _resolve_return_type(request_func: Callable) -> Any:
+    """Reads return annotation of the API method. String annotations (PEP 563) are evaluated."""
+    return_type = request_func.__annotations__.get("return")
+    if isinstance(return_type, str):
+        return_type = eval(return_type, request_func.__globals__)
+
+    return return_type
+
+
+def _response_decoder(return_type: Any, trusted: bool) -> Callable[[httpx.Response], Any]:
+    """
+    Picks how the response is turned into the return value, so it's not decided on every request.
+
+    :raises ValueError: In case return type is not supported
+    """
+    # Typing constructs (`None`, `list[int]`, `Union[...]`) are not classes, `issubclass` can't take them.
+    is_class = _is_class(return_type)
+
+    if is_class and issubclass(return_type, BaseModel):
+        if trusted:
+
+            def decode_trusted_model(response: httpx.Response) -> BaseModel:
+                return return_type.model_construct(**from_json(response.content))
+
+            return decode_trusted_model
+
+        def decode_model(response: httpx.Response) -> BaseModel:
+            return return_type.model_validate_json(response.content)
+
+        return decode_model
+
+    if is_class and issubclass(return_type, JSON):
+
+        def decode_json(response: httpx.Response) -> JSON:
+            return return_type(from_json(response.content))
+
+        return decode_json
+
+    if is_class and issubclass(return_type, httpx.Response):
+
+        def decode_response(response: httpx.Response) -> httpx.Response:
+            return response
+
+        return decode_response
+
+    raise ValueError(
+        f"You need to specify return typehint using one of the supported types: {valid_return_types}.\n\t"
+        f"Type specified is: {return_type}"
+    )
+
+
+_api_call_ids = itertools.count()
+
+
+def _compile_api_call(
+    method: str,
+    url: str,
+    type_adapters: ApiMethodTypeAdapters,
+    decode: Callable[[httpx.Response], Any],
+    encoder: Callable[[dict[str, Any]], bytes] | None = None,
+) -> Callable:
+    """
+    Generates source of the API method for a single endpoint and compiles it. Every step, from picking
+    validated params, through formatting URL, query and headers, to serializing the body, is unrolled
+    into straight-line code, so no generic plan is interpreted on requests.
+
+    :raises ValueError: In case URL placeholder has no matching path param
+    """
+    # Globals are all private, so they can't be shadowed by params.
+    namespace = {
+        "_Request": httpx.Request,
+        "_filter": filter,
+        "_encode_query_param": _encode_query_param,
+        "_encode_header_value": _encode_header_value,
+        "_method": method,
+        "_decode": decode,
+        "_static_headers": type_adapters._static_headers,
+    }
+
+    param_keys = tuple(type_adapters._params.request)
+    if not param_keys:
+        lines = ["def api_call(self):"]
+    else:
+        # Params not given are seen as the sentinel, which fails the fast path, so Pydantic reports them missing.
+        namespace["_missing"] = _MISSING
+        namespace["_validate_python"] = type_adapters._request.validate_python
+        if any(param_key.startswith("_") for param_key in param_keys):
+            # Private param names could clash with the globals, so they're picked from kwargs into locals.
+            lines = ["def api_call(self, **kwargs):"]
+            names = tuple(f"_param{index}" for index in range(len(param_keys)))
+            lines += [f"    {name} = kwargs.get({param_key!r}, _missing)" for name, param_key in zip(names, param_keys)]
+            fast_path = f"len(kwargs) == {len(param_keys)} and "
+            given = "kwargs"
+            slow_path = "_validate_python(kwargs)"
+        else:
+            # Params are declared explicitly, so Python binds arguments itself and the fast path checks locals.
+            lines = [f"def api_call(self, *, {', '.join(f'{param_key}=_missing' for param_key in param_keys)}):"]
+            names = param_keys
+            fast_path = ""
+            given = "{" + ", ".join(f"{param_key!r}: {param_key}" for param_key in param_keys) + "}"
+            pairs = ", ".join(f"({param_key!r}, {param_key})" for param_key in param_keys)
+            slow_path = f"_validate_python({{key: value for key, value in ({pairs},) if value is not _missing}})"
+
+        if type_adapters._fast_fields is not None:
+            fast_path += _fast_conditions(type_adapters._fast_fields, names, namespace)
+            lines += [
+                f"    if {fast_path}:",
+                f"        validated = {given}",
+                "    else:",
+                f"        validated = {slow_path}",
+            ]
+        else:
+            lines.append(f"    validated = {slow_path}")
+
+    if type_adapters._request is not None:
+        namespace["_serialize"] = type_adapters._request.serializer.to_json
+
+    # URL path. Each placeholder becomes a local, so the f-string has no expressions needing quotes or escapes.
+    # Relative URLs are prefixed with the client's base URL, like `httpx.Client.build_request` would do.
+    # The base is resolved once per client, so only the string concatenation remains for each request.
+    relative = not urlsplit(url).scheme
+    if relative and not url.startswith("/"):
+        url = "/" + url
+    path_keys = {alias: param_key for param_key, alias in type_adapters._path_aliases}
+    template = ""
+    literal_url = ""
+    has_placeholders = False
+    for index, (literal, field_name, format_spec, conversion) in enumerate(string.Formatter().parse(url)):
+        literal_url += literal
+        template += literal.replace("{", "{{").replace("}", "}}")
+        if field_name is None:
+            continue
+        if field_name not in path_keys:
+            raise ValueError(f"URL placeholder {{{field_name}}} of {url!r} has no matching path param.")
+        if "{" in format_spec:
+            raise ValueError(f"URL placeholder {{{field_name}}} of {url!r} has nested fields in its format spec.")
+        lines.append(f"    _path{index} = validated[{path_keys[field_name]!r}]")
+        # Conversion and format spec are kept, so the f-string formats values just like `str.format` would.
+        conversion = f"!{conversion}" if conversion else ""
+        format_spec = f":{format_spec}" if format_spec else ""
+        template += f"{{_path{index}{conversion}{format_spec}}}"
+        has_placeholders = True
+
+    base_expr = "self._base_url + " if relative else ""
+    if has_placeholders:
+        url_expr = f"{base_expr}f{template!r}"
+    elif type_adapters._query_prefixes:
+        url_expr = f"{base_expr}{literal_url!r}"
+    elif relative:
+        # Parsed once per client and memoized, as `httpx.URL` is immutable.
+        namespace["_URL"] = httpx.URL
+        namespace["_url_path"] = literal_url
+        lines += [
+            "    _url = self._urls.get(_url_path)",
+            "    if _url is None:",
+            "        _url = self._urls[_url_path] = _URL(self._base_url + _url_path)",
+        ]
+        url_expr = "_url"
+    else:
+        # Parsed once and shared.
+        namespace["_url"] = httpx.URL(literal_url)
+        url_expr = "_url"
+
+    # Query string is encoded by hand, bypassing HTTPX `QueryParams`. A query already in the URL is kept.
+    if type_adapters._query_prefixes:
+        query_parts = []
+        for index, (param_key, prefix) in enumerate(type_adapters._query_prefixes):
+            namespace[f"_query{index}"] = prefix
+            query_parts.append(f"_encode_query_param(_query{index}, validated[{param_key!r}])")
+        separator = "&" if "?" in literal_url else "?"
+        lines.append(f"    query = '&'.join(_filter(None, ({', '.join(query_parts)},)))")
+        lines.append(f"    url = {url_expr} + {separator!r} + query if query else {url_expr}")
+    else:
+        lines.append(f"    url = {url_expr}")
+
+    if type_adapters._header_aliases:
+        # Headers valued `None` are left out, rather than sent as a "None" string.
+        header_items = ", ".join(
+            f"({alias!r}, validated[{param_key!r}])" for param_key, alias in type_adapters._header_aliases
+        )
+        lines.append(
+            "    headers = _static_headers + tuple((name, _encode_header_value(value))"
+            f" for name, value in ({header_items},) if value is not None)"
+        )
+    else:
+        # Shared between requests, HTTPX copies headers into its own structure anyway.
+        lines.append("    headers = _static_headers")
+
+    # The whole body is serialized in one call by the request schema, which dumps only the keys it's given.
+    if encoder is not None and type_adapters._params.body:
+        namespace["_encode"] = encoder
+        body_items = ", ".join(
+            f"{_serialization_alias(param_key, param_spec)!r}: validated[{param_key!r}]"
+            for param_key, param_spec in type_adapters._params.body.items()
+        )
+        lines.append(f"    content = _encode({{{body_items}}})")
+    elif type_adapters._body_only:
+        lines.append("    content = _serialize(validated, by_alias=True)")
+    elif type_adapters._params.body:
+        body_items = ", ".join(f"{param_key!r}: validated[{param_key!r}]" for param_key in type_adapters._params.body)
+        lines.append(f"    content = _serialize({{{body_items}}}, by_alias=True)")
+    else:
+        lines.append("    content = None")
+
+    # `httpx.Request` is built directly, since all its parts are already known. `Client.build_request`
+    # would only redo the work, deciding between `content`/`data`/`json`/`files` and merging headers.
+    lines += [
+        "    response = self._adapter.send(_Request(_method, url=url, content=content, headers=headers))",
+        "    response.raise_for_status()",
+        "    return _decode(response)",
+    ]
+
+    # Source is registered in `linecache`, so tracebacks through the API method show its lines.
+    # Numbered filenames keep endpoints with the same method and URL apart.
+    source = "\n".join(lines) + "\n"
+    filename = f"<fastclient {method} {url} #{next(_api_call_ids)}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["api_call"]
+
+
+def api_call(
+    method: Literal["GET", "POST"],
+    url: str,
+    *,
+    trusted: bool = False,
+    encoder: Callable[[dict[str, Any]], bytes] | None = None,
+):
+    """
+    :param trusted: Skip validation of the response model. Use only for APIs you control,
+        since nested models are not constructed and invalid data passes through silently.
+    :param encoder: Serializes the request body instead of Pydantic. It's given validated body params
+        keyed by their aliases, models and dataclasses as they are, so it must handle those types itself.
+        Eg. `orjson.dumps` handles TypedDict, dataclass and primitive bodies, but not Pydantic models.
+    """
 
-def api_call(method: Literal["GET", "POST"], url: str):
     def decorator(request_func: Callable[..., R]) -> Callable[..., R]:
-        return_type = get_type_hints(request_func).get("return")
-
-        if not issubclass(return_type, valid_return_types):
-            raise ValueError(
-                f"You need to specify return typehint using one of the supported types: {valid_return_types}.\n\t"
-                f"Type specified is: {return_type}"
-            )
-
+        return_type = _resolve_return_type(request_func)
         method_params = ApiMethodParams.from_api_method(request_func)
-        type_adapters = ApiMethodTypeAdapters(method_params)
-
-        @wraps(request_func)
-        def wrapper(self: ApiClient, *args, **kwargs) -> R:
-            validated_params = type_adapters.validate_request_params(kwargs)
-
-            response = self._adapter.send(type_adapters.build_request(method, url, **validated_params))
-            response.raise_for_status()
+        decode = _response_decoder(return_type, trusted)
 
-            if issubclass(return_type, BaseModel):
-                return return_type.model_validate_json(response.content)
-            elif issubclass(return_type, (JSON, dict)):
-                return return_type(response.json())
-            else:
-                return response
+        type_adapters = ApiMethodTypeAdapters.from_params(method_params)
+        wrapper = wraps(request_func)(_compile_api_call(method, url, type_adapters, decode, encoder))
 
+        # Parse plan and adapters computed at decoration time, exposed for introspection.
+        wrapper._fc_param_spec = method_params
+        wrapper._fc_type_adapters = type_adapters
         return wrapper
 
     return decorator
 
 
-def get(url: str):
-    return api_call("GET", url)
+def get(url: str, *, trusted: bool = False, encoder: Callable[[dict[str, Any]], bytes] | None = None):
+    return api_call("GET", url, trusted=trusted, encoder=encoder)
 
 
-def post(url: str):
-    return api_call("POST", url)
+def post(url: str, *, trusted: bool = False, encoder: Callable[[dict[str, Any]], bytes] | None = None):
+    return api_call("POST", url, trusted=trusted, encoder=encoder)
 
 
 class ApiClient:
     def __init__(self, adapter: httpx.Client):
         self._adapter = adapter
+        # Prefix of relative endpoint URLs, which always start with a slash.
+        self._base_url = str(adapter.base_url).rstrip("/")
+        # Parsed URLs of endpoints without params, keyed by path.
+        self._urls: dict[str, httpx.URL] = {}
@@ -1,17 +1,21 @@
 import dataclasses
+import json
+import traceback
 from collections.abc import Callable
 from typing import Annotated, Type, TypedDict, TypeVar
 from unittest import mock
 
+import fastapi
 import httpx
 import pydantic
 import pydantic_core
 import pytest
+import typing_extensions
 from annotated_types import Gt
 from pytest_mock import MockerFixture
 
 import fastclient
-from fastclient import Path, Query
+from fastclient import Header, Path, Query
 from fastclient.client import ApiClient, get
 
 PositiveInt = Annotated[int, Gt(0)]
@@ -34,11 +38,18 @@ def client_factory(httpx_client) -> Callable[[Type[CT]], CT]:
     return lambda cls: cls(httpx_client)
 
 
-@pytest.fixture
-def httpx_client(mocker: MockerFixture):
+@pytest.fixture(scope="session")
+def httpx_client():
+    """Built once, as `httpx.Client` is costly to construct. Its mocked `send` is reset after each test."""
     c = httpx.Client(base_url="https://httpbin.org")
-    mocker.patch.object(c, "send")
-    return c
+    with mock.patch.object(c, "send"):
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def reset_httpx_client(httpx_client):
+    yield
+    httpx_client.send.reset_mock(return_value=True, side_effect=True)
 
 
 @pytest.fixture()
@@ -101,6 +112,71 @@ def test_path_params_using_kwargs(
     assert f"/posts/{post_id}/comments" == httpx_request.url.path
 
 
+def test_path_params_using_alias(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/posts/{post_id}/comments")
+        def path_params_using_alias(
+            self, *, for_post_id: Annotated[PositiveInt, Path(serialization_alias="post_id")]
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.path_params_using_alias(for_post_id=123)
+
+    assert "/posts/123/comments" == httpx_request.url.path
+
+
+def test_header_params_using_kwargs(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/posts")
+        def header_params_using_kwargs(
+            self, *, request_id: Annotated[str, Header(serialization_alias="X-Request-ID")]
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.header_params_using_kwargs(request_id="abc")
+
+    assert "abc" == httpx_request.headers["X-Request-ID"]
+    assert "application/json" == httpx_request.headers["Content-Type"]
+
+
+def test_non_str_header_params(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/posts")
+        def header_params_using_kwargs(
+            self,
+            *,
+            x_page_size: Annotated[int, Header()],
+            x_draft: Annotated[bool, Header()],
+            user_agent_id: Annotated[int, Header(convert_underscores=False)],
+            x_trace: Annotated[str | None, Header()],
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.header_params_using_kwargs(x_page_size=10, x_draft=True, user_agent_id=1, x_trace=None)
+
+    assert "10" == httpx_request.headers["X-Page-Size"]
+    assert "true" == httpx_request.headers["X-Draft"]
+    assert "1" == httpx_request.headers["user_agent_id"]
+    assert "X-Trace" not in httpx_request.headers
+
+
+def test_cookie_params_are_not_supported():
+    with pytest.raises(NotImplementedError):
+
+        class TestClient(ApiClient):
+            @get("/posts")
+            def get_posts(self, *, session: Annotated[str, fastapi.Cookie()]) -> httpx.Response: ...
+
+
 def test_request_body_with_model(
     client_factory,
     httpx_request: httpx.Request,
@@ -167,6 +243,20 @@ def test_request_body_with_multiple_models(
     )
 
 
+def test_request_body_with_generic_alias(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/posts")
+        def create_posts(self, *, posts: Annotated[list[CreatePostRequest], fastclient.Body()]) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.create_posts(posts=[CreatePostRequest(title="Title", body="Body")])
+
+    assert b'{"posts":[{"title":"Title","body":"Body"}]}' == httpx_request.content
+
+
 def test_request_body_with_explicit_annotations(
     client_factory,
     httpx_request: httpx.Request,
@@ -235,6 +325,24 @@ def test_request_body_with_typeddict(
     )
 
 
+def test_request_body_with_custom_encoder(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    QuickPost = typing_extensions.TypedDict("QuickPost", {"title": str, "body": str})
+
+    class TestClient(ApiClient):
+        @get("/posts", encoder=lambda body: json.dumps(body, separators=(",", ":")).encode())
+        def create_post(
+            self, *, post: Annotated[QuickPost, fastclient.Body(serialization_alias="quick_post")]
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.create_post(post=QuickPost(title="Title", body="Body"))
+
+    assert b'{"quick_post":{"title":"Title","body":"Body"}}' == httpx_request.content
+
+
 def test_request_body_with_dataclass(
     client_factory,
     httpx_request: httpx.Request,
@@ -267,3 +375,334 @@ def test_request_body_with_dataclass(
         )
         == httpx_request.content
     )
+
+
+def test_trusted_response_model(
+    client_factory,
+    httpx_client: mock.Mock,
+):
+    class Post(pydantic.BaseModel):
+        id: int
+        title: str
+
+    class TestClient(ApiClient):
+        @get("/posts/{post_id}", trusted=True)
+        def get_post(self, *, post_id: Annotated[PositiveInt, Path()]) -> Post: ...
+
+    httpx_client.send.return_value = httpx.Response(
+        200,
+        json={"id": 1, "title": "Trusted"},
+        request=httpx.Request("GET", "https://httpbin.org/posts/1"),
+    )
+
+    client = client_factory(TestClient)
+
+    assert Post(id=1, title="Trusted") == client.get_post(post_id=1)
+
+
+def test_scalar_params_are_validated(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/comments")
+        def scalar_params(
+            self, *, page: Annotated[int, Query()], search: Annotated[str, Query()]
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    client.scalar_params(page=2, search="api")
+    assert b"page=2&search=api" == httpx_request.url.query
+
+    client.scalar_params(page="3", search="api")
+    assert b"page=3&search=api" == httpx_request.url.query
+
+    with pytest.raises(pydantic.ValidationError):
+        client.scalar_params(page="three", search="api")
+
+
+def test_request_body_with_path_and_query_params(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/posts/{post_id}/comments")
+        def create_comment(
+            self,
+            *,
+            post_id: Annotated[PositiveInt, Path()],
+            notify: Annotated[bool, Query()],
+            comment: CreateCommentRequest,
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.create_comment(post_id=1, notify=True, comment=CreateCommentRequest(user_id=2, body="Nice post!"))
+
+    assert "/posts/1/comments" == httpx_request.url.path
+    assert b"notify=true" == httpx_request.url.query
+    assert pydantic_core.to_json({"comment": {"user_id": 2, "body": "Nice post!"}}) == httpx_request.content
+
+
+def test_json_response(
+    client_factory,
+    httpx_client: mock.Mock,
+):
+    class TestClient(ApiClient):
+        @get("/posts/{post_id}")
+        def get_post(self, *, post_id: Annotated[PositiveInt, Path()]) -> dict: ...
+
+    httpx_client.send.return_value = httpx.Response(
+        200,
+        json={"id": 1, "title": "Zażółć gęślą jaźń"},
+        request=httpx.Request("GET", "https://httpbin.org/posts/1"),
+    )
+
+    client = client_factory(TestClient)
+
+    assert {"id": 1, "title": "Zażółć gęślą jaźń"} == client.get_post(post_id=1)
+
+
+@pytest.mark.parametrize("return_type", [None, list[int], str])
+def test_unsupported_return_type(return_type):
+    def get_posts(self) -> return_type: ...
+
+    with pytest.raises(ValueError):
+        get("/posts")(get_posts)
+
+
+def test_adapters_are_built_at_decoration_time(client_factory):
+    class TestClient(ApiClient):
+        @get("/posts")
+        def create_post_with_comment(
+            self, *, post: CreatePostRequest, comment: CreateCommentRequest
+        ) -> httpx.Response: ...
+
+    type_adapters = TestClient.create_post_with_comment._fc_type_adapters
+    adapters_built = fastclient.client._typed_dict_adapter.cache_info().misses
+
+    client = client_factory(TestClient)
+    for _ in range(2):
+        client.create_post_with_comment(
+            post=CreatePostRequest(title="Title", body="Body"),
+            comment=CreateCommentRequest(user_id=1, body="Comment"),
+        )
+
+    assert type_adapters is TestClient.create_post_with_comment._fc_type_adapters
+    assert adapters_built == fastclient.client._typed_dict_adapter.cache_info().misses
+
+
+def test_body_instances_skip_validation(
+    client_factory,
+    httpx_request: httpx.Request,
+    mocker: MockerFixture,
+):
+    # Spied before decoration, since generated API methods bind `validate_python` upfront.
+    validate_python = mocker.spy(pydantic.TypeAdapter, "validate_python")
+
+    @dataclasses.dataclass
+    class CreatePostData:
+        title: str
+        body: str
+
+    class TestClient(ApiClient):
+        @get("/posts")
+        def create_post(self, *, post: CreatePostData) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    client.create_post(post=CreatePostData(title="Title", body="Body"))
+    validate_python.assert_not_called()
+    assert b'{"post":{"title":"Title","body":"Body"}}' == httpx_request.content
+
+    client.create_post(post={"title": "Title", "body": "Body"})
+    validate_python.assert_called_once()
+    assert b'{"post":{"title":"Title","body":"Body"}}' == httpx_request.content
+
+
+def test_unhashable_annotation_metadata(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/comments")
+        def search_comments(self, *, user_id: Annotated[int, ["Author of comments"], Query()]) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    client.search_comments(user_id="1")
+    assert b"user_id=1" == httpx_request.url.query
+
+    with pytest.raises(pydantic.ValidationError):
+        client.search_comments(user_id="abc")
+
+
+def test_constrained_scalar_params_are_validated(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/posts/{post_id}/comments")
+        def path_params_using_kwargs(self, *, post_id: Annotated[PositiveInt, Path()]) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    client.path_params_using_kwargs(post_id=1)
+    assert "/posts/1/comments" == httpx_request.url.path
+
+    with pytest.raises(pydantic.ValidationError):
+        client.path_params_using_kwargs(post_id=0)
+
+
+def test_chained_constraints_are_validated(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/comments")
+        def search_comments(
+            self,
+            *,
+            page: Annotated[int, Query(ge=1, le=10)],
+            q: Annotated[str, Query(min_length=2, max_length=4)],
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    client.search_comments(page=10, q="abc")
+    assert "page=10&q=abc" == httpx_request.url.query.decode()
+
+    for page, q in ((0, "abc"), (11, "abc"), (1, "a"), (1, "abcde")):
+        with pytest.raises(pydantic.ValidationError):
+            client.search_comments(page=page, q=q)
+
+
+def test_urls_are_joined_with_base_url(mocker: MockerFixture):
+    class TestClient(ApiClient):
+        @get("/posts")
+        def get_posts(self) -> httpx.Response: ...
+
+        @get("posts/{post_id}")
+        def get_post(self, *, post_id: Annotated[int, Path()]) -> httpx.Response: ...
+
+    httpx_client = httpx.Client(base_url="https://httpbin.org/api/v1/")
+    send = mocker.patch.object(httpx_client, "send")
+    client = TestClient(httpx_client)
+
+    client.get_posts()
+    assert "https://httpbin.org/api/v1/posts" == str(send.call_args.args[0].url)
+
+    client.get_post(post_id=1)
+    assert "https://httpbin.org/api/v1/posts/1" == str(send.call_args.args[0].url)
+
+
+def test_missing_params_are_reported(client_factory):
+    class TestClient(ApiClient):
+        @get("/posts/{post_id}/comments")
+        def get_comments(self, *, post_id: Annotated[int, Path()], type: Annotated[str, Query()]) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        client.get_comments(post_id=1)
+    assert [("type",)] == [error["loc"] for error in exc_info.value.errors()]
+
+    with pytest.raises(TypeError):
+        client.get_comments(post_id=1, type="reply", sort="desc")
+
+
+def test_private_param_names(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/comments")
+        def search_comments(
+            self, *, _page: Annotated[int, Query(ge=1, serialization_alias="page")]
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    client.search_comments(_page=2)
+    assert b"page=2" == httpx_request.url.query
+    client.search_comments(_page="3")
+    assert b"page=3" == httpx_request.url.query
+
+    with pytest.raises(pydantic.ValidationError):
+        client.search_comments(_page=0)
+    with pytest.raises(pydantic.ValidationError):
+        client.search_comments()
+
+
+def test_tracebacks_show_generated_source(client_factory):
+    class TestClient(ApiClient):
+        @get("/posts/{post_id}")
+        def get_post(self, *, post_id: Annotated[int, Path()]) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        client.get_post(post_id="abc")
+    assert "_validate_python(" in "".join(traceback.format_tb(exc_info.tb))
+
+
+def test_request_without_params(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/posts")
+        def get_posts(self) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.get_posts()
+
+    assert "GET" == httpx_request.method
+    assert "/posts" == httpx_request.url.path
+    assert b"" == httpx_request.content
+
+
+def test_query_params_are_encoded(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/comments?sort=desc")
+        def search_comments(
+            self,
+            *,
+            search: Annotated[str, Query(serialization_alias="q")],
+            tags: Annotated[list[str], Query()],
+            draft: Annotated[bool | None, Query()],
+        ) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.search_comments(search="Zażółć & gęślą/jaźń", tags=["a b", "c"], draft=None)
+
+    expected = httpx.Request(
+        "GET",
+        "/comments?sort=desc",
+        params=[("q", "Zażółć & gęślą/jaźń"), ("tags", "a b"), ("tags", "c"), ("draft", None)],
+    )
+    assert expected.url.query == httpx_request.url.query
+
+
+def test_url_placeholder_format_spec(
+    client_factory,
+    httpx_request: httpx.Request,
+):
+    class TestClient(ApiClient):
+        @get("/items/{item_id:04d}/{slug!s:>6}")
+        def get_item(self, *, item_id: Annotated[int, Path()], slug: Annotated[str, Path()]) -> httpx.Response: ...
+
+    client = client_factory(TestClient)
+    client.get_item(item_id=7, slug="abc")
+
+    assert "/items/0007/%20%20%20abc" == httpx_request.url.raw_path.decode()
+
+
+def test_url_placeholder_without_path_param():
+    def get_post(self, *, post_id: Annotated[PositiveInt, Query()]) -> httpx.Response: ...
+
+    with pytest.raises(ValueError):
+        get("/posts/{post_id}")(get_post)